@@ -0,0 +1,106 @@
+-- ============================================
+-- Supabase Migration - Performance Functions
+-- ============================================
+-- Run this in Supabase SQL Editor BEFORE deploying
+-- Adds the RPC functions used by DatabaseService to cut round-trips
+
+-- Step 1: Roast counts per level in a single query (used by /stats)
+CREATE OR REPLACE FUNCTION get_roast_level_stats()
+RETURNS TABLE(roast_level TEXT, cnt BIGINT) AS $$
+    SELECT roast_level, COUNT(*) FROM roasts GROUP BY roast_level
+$$ LANGUAGE sql STABLE;
+
+-- Step 2: Upsert user + log login event in a single round-trip (used by OAuth callback)
+CREATE OR REPLACE FUNCTION login_user(
+    p_email TEXT,
+    p_name TEXT,
+    p_provider_id TEXT,
+    p_picture TEXT,
+    p_provider TEXT,
+    p_ip TEXT,
+    p_ua TEXT
+)
+RETURNS UUID AS $$
+DECLARE
+    v_id UUID;
+BEGIN
+    INSERT INTO users (provider_id, email, name, picture, provider, last_login)
+    VALUES (p_provider_id, p_email, p_name, p_picture, p_provider, now())
+    ON CONFLICT (provider_id, provider) DO UPDATE
+    SET email = EXCLUDED.email,
+        name = EXCLUDED.name,
+        picture = EXCLUDED.picture,
+        last_login = EXCLUDED.last_login
+    RETURNING id INTO v_id;
+
+    INSERT INTO login_events (user_id, provider, success, timestamp, ip_address, user_agent)
+    VALUES (v_id, p_provider, TRUE, now(), p_ip, p_ua);
+
+    RETURN v_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Step 3: Cheap connectivity check (used by /health)
+CREATE OR REPLACE FUNCTION ping()
+RETURNS INTEGER AS $$
+    SELECT 1
+$$ LANGUAGE sql STABLE;
+
+-- Step 4: Let the database stamp timestamps instead of the API
+ALTER TABLE users ALTER COLUMN last_login SET DEFAULT now();
+ALTER TABLE login_events ALTER COLUMN timestamp SET DEFAULT now();
+ALTER TABLE roasts ALTER COLUMN created_at SET DEFAULT now();
+
+-- Defaults only apply on insert, so refresh last_login when a returning user is upserted.
+-- Only PostgREST POSTs (the upsert_user fallback's upsert) count as a login; other
+-- updates such as profile edits or backfills leave last_login alone.
+-- login_user() sets last_login itself.
+CREATE OR REPLACE FUNCTION set_last_login()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.last_login = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_set_last_login ON users;
+CREATE TRIGGER users_set_last_login
+BEFORE UPDATE ON users
+FOR EACH ROW
+WHEN (current_setting('request.method', true) = 'POST')
+EXECUTE FUNCTION set_last_login();
+
+-- Step 5: Normalize stored emails for index lookups
+-- The API stores and queries emails lowercased; PostgREST filters can't use an
+-- expression index on lower(email), so normalize the data instead. The UNIQUE
+-- constraint on users.email (see SUPABASE_INTEGRATION.md) already provides the
+-- btree index the lookup uses.
+
+-- Abort if lowercasing would collide with the UNIQUE constraint; merge those users first
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM users GROUP BY lower(email) HAVING COUNT(*) > 1) THEN
+        RAISE EXCEPTION 'users has emails that differ only by case - merge them before running Step 5';
+    END IF;
+END;
+$$;
+
+-- users_set_last_login only fires for PostgREST requests, so this leaves last_login alone
+UPDATE users SET email = lower(email) WHERE email <> lower(email);
+
+-- ============================================
+-- Verification Queries
+-- ============================================
+
+-- Check the stats function returns one row per roast level
+SELECT * FROM get_roast_level_stats();
+
+-- Check timestamp defaults are set
+SELECT table_name, column_name, column_default
+FROM information_schema.columns
+WHERE (table_name, column_name) IN (('users', 'last_login'), ('login_events', 'timestamp'), ('roasts', 'created_at'));
+
+-- Check all functions exist
+SELECT routine_name
+FROM information_schema.routines
+WHERE routine_name IN ('get_roast_level_stats', 'login_user', 'ping');
@@ -18,6 +18,13 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     
+    # Supabase connection pooler (optional - Supavisor transaction mode, port 6543)
+    # e.g. postgresql://postgres.<project>:<password>@aws-0-<region>.pooler.supabase.com:6543/postgres
+    supabase_pooler_url: Optional[str] = None
+    
+    # Supabase read replica API URL (optional - reads fall back to supabase_url)
+    supabase_replica_url: Optional[str] = None
+    
     # Google OAuth Configuration (optional - only needed for auth endpoints)
     google_client_id: Optional[str] = None
     google_client_secret: Optional[str] = None
@@ -34,6 +41,7 @@ class Settings(BaseSettings):
     # Application Configuration
     app_name: str = "RoastMyStartup API"
     debug: bool = False
+    log_level: str = "INFO"  # Set to WARNING in production to skip per-request logs
     
     class Config:
         env_file = ".env"
@@ -11,7 +11,7 @@ from app.config.settings import settings
 from app.routes.auth import router as auth_router
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=settings.log_level.upper())
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
@@ -36,16 +36,24 @@ app.include_router(auth_router)
 @app.on_event("startup")
 async def startup_event():
     """Startup event to validate configuration"""
-    logger.info(f"Starting {settings.app_name}")
-    logger.info(f"Using Gemini model: {settings.gemini_model}")
+    logger.info("Starting %s", settings.app_name)
+    logger.info("Using Gemini model: %s", settings.gemini_model)
     logger.info("✅ Gemini API key configured successfully")
     
+    # Start batching roast and login event inserts
+    await db_service.start()
+    
     # Test database connection
-    if db_service.health_check():
+    if await db_service.health_check():
         logger.info("✅ Supabase database connection healthy")
     else:
         logger.warning("⚠️ Supabase database connection failed - roasts will not be persisted")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shutdown event to flush pending writes and release database connections"""
+    await db_service.close()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -54,7 +62,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint to verify the service is running"""
-    db_healthy = db_service.health_check()
+    db_healthy = await db_service.health_check()
     return {
         "status": "alive", 
         "model": settings.gemini_model,
@@ -64,7 +72,7 @@ async def health_check():
 @app.get("/stats")
 async def get_stats():
     """Get roast statistics from the database"""
-    stats = db_service.get_roast_stats()
+    stats = await db_service.get_roast_stats()
     if stats:
         return stats
     else:
@@ -94,7 +102,7 @@ async def roast_startup(request: RoastRequest, authorization: Optional[str] = He
     will be linked to their user account.
     """
     try:
-        logger.info(f"Processing roast request for: {request.startup_name}")
+        logger.debug("Processing roast request for: %s", request.startup_name)
         
         # Extract user_id from JWT token if present
         user_id = None
@@ -107,29 +115,29 @@ async def roast_startup(request: RoastRequest, authorization: Optional[str] = He
                     algorithms=[settings.jwt_algorithm]
                 )
                 user_id = payload.get("user_id")
-                logger.info(f"Authenticated user_id: {user_id}")
+                logger.debug("Authenticated user_id: %s", user_id)
             except jwt.ExpiredSignatureError:
                 logger.warning("JWT token expired - proceeding as anonymous user")
             except jwt.InvalidTokenError as e:
-                logger.warning(f"Invalid JWT token: {str(e)} - proceeding as anonymous user")
+                logger.warning("Invalid JWT token: %s - proceeding as anonymous user", e)
             except Exception as e:
-                logger.warning(f"JWT decode error: {str(e)} - proceeding as anonymous user")
+                logger.warning("JWT decode error: %s - proceeding as anonymous user", e)
         
         # Generate the roast using Gemini AI with retry logic
         roast_response = await roast_service.analyze_startup(request)
         
-        logger.info(f"Successfully generated roast for: {request.startup_name}")
+        logger.debug("Successfully generated roast for: %s", request.startup_name)
         
         # Save to database in the background (fail-safe - don't block user response)
         try:
-            db_result = db_service.save_roast(request, roast_response, user_id=user_id)
-            if db_result:
-                logger.info(f"✅ Roast for {request.startup_name} saved to database")
+            saved = await db_service.save_roast(request, roast_response, user_id=user_id)
+            if saved:
+                logger.debug("✅ Roast for %s queued for database", request.startup_name)
             else:
-                logger.warning(f"⚠️ Failed to save roast for {request.startup_name} to database")
+                logger.warning("⚠️ Failed to save roast for %s to database", request.startup_name)
         except Exception as db_error:
             # Log the database error but don't raise - user must get their roast
-            logger.error(f"❌ Database save error for {request.startup_name}: {str(db_error)}")
+            logger.error("❌ Database save error for %s: %s", request.startup_name, db_error)
         
         return roast_response
         
@@ -139,7 +147,7 @@ async def roast_startup(request: RoastRequest, authorization: Optional[str] = He
     
     except Exception as e:
         # Handle any unexpected errors not caught by the service
-        logger.error(f"Unexpected error in roast endpoint for {request.startup_name}: {str(e)}")
+        logger.error("Unexpected error in roast endpoint for %s: %s", request.startup_name, e)
         raise HTTPException(
             status_code=500,
             detail="An unexpected error occurred while processing your roast request. Please try again."
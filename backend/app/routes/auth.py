@@ -116,17 +116,17 @@ async def google_login():
         # Construct the authorization URL
         auth_url = f"{GOOGLE_AUTH_URL}?{'&'.join([f'{k}={v}' for k, v in params.items()])}"
         
-        logger.info("Redirecting user to Google OAuth consent screen")
+        logger.debug("Redirecting user to Google OAuth consent screen")
         return RedirectResponse(url=auth_url)
         
     except ValueError as e:
-        logger.error(f"OAuth configuration error: {str(e)}")
+        logger.error("OAuth configuration error: %s", e)
         raise HTTPException(
             status_code=500,
             detail="OAuth configuration error. Please contact support."
         )
     except Exception as e:
-        logger.error(f"Error initiating Google OAuth: {str(e)}")
+        logger.error("Error initiating Google OAuth: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Failed to initiate Google login. Please try again."
@@ -152,7 +152,7 @@ async def google_callback(request: Request, code: Optional[str] = None, error: O
     try:
         # Check if Google returned an error
         if error:
-            logger.error(f"Google OAuth error: {error}")
+            logger.error("Google OAuth error: %s", error)
             error_url = f"{FRONTEND_CALLBACK_URL}?error=oauth_failed"
             return RedirectResponse(url=error_url)
         
@@ -165,7 +165,7 @@ async def google_callback(request: Request, code: Optional[str] = None, error: O
         # Validate configuration
         validate_oauth_config()
         
-        logger.info("Exchanging authorization code for access token")
+        logger.debug("Exchanging authorization code for access token")
         
         # Exchange authorization code for access token
         token_data = {
@@ -179,7 +179,7 @@ async def google_callback(request: Request, code: Optional[str] = None, error: O
         token_response = requests.post(GOOGLE_TOKEN_URL, data=token_data, timeout=10)
         
         if token_response.status_code != 200:
-            logger.error(f"Failed to exchange code for token: {token_response.text}")
+            logger.error("Failed to exchange code for token: %s", token_response.text)
             error_url = f"{FRONTEND_CALLBACK_URL}?error=token_exchange_failed"
             return RedirectResponse(url=error_url)
         
@@ -191,14 +191,14 @@ async def google_callback(request: Request, code: Optional[str] = None, error: O
             error_url = f"{FRONTEND_CALLBACK_URL}?error=no_access_token"
             return RedirectResponse(url=error_url)
         
-        logger.info("Successfully obtained access token, fetching user profile")
+        logger.debug("Successfully obtained access token, fetching user profile")
         
         # Fetch user profile information
         headers = {"Authorization": f"Bearer {access_token}"}
         userinfo_response = requests.get(GOOGLE_USERINFO_URL, headers=headers, timeout=10)
         
         if userinfo_response.status_code != 200:
-            logger.error(f"Failed to fetch user info: {userinfo_response.text}")
+            logger.error("Failed to fetch user info: %s", userinfo_response.text)
             error_url = f"{FRONTEND_CALLBACK_URL}?error=userinfo_failed"
             return RedirectResponse(url=error_url)
         
@@ -213,30 +213,24 @@ async def google_callback(request: Request, code: Optional[str] = None, error: O
             error_url = f"{FRONTEND_CALLBACK_URL}?error=no_email"
             return RedirectResponse(url=error_url)
         
-        logger.info(f"Successfully authenticated user: {email} (provider_id: {provider_id})")
+        logger.debug("Successfully authenticated user: %s (provider_id: %s)", email, provider_id)
         
-        # Persist user to database (upsert to handle returning users)
+        # Persist user and log the login event (upsert to handle returning users)
         try:
             from app.services.db_service import db_service
-            user_id = db_service.upsert_user(
+            user_id = await db_service.login_user(
                 email=email, 
                 name=name, 
                 provider_id=provider_id,
                 picture=picture,
-                provider="google"
-            )
-            logger.info(f"User {email} persisted to database with ID: {user_id}")
-            
-            # Log the login event
-            db_service.log_login_event(
-                user_id=user_id,
                 provider="google",
                 ip_address=request.client.host if hasattr(request, 'client') else None,
                 user_agent=request.headers.get("user-agent")
             )
+            logger.debug("User %s persisted to database with ID: %s", email, user_id)
         except Exception as db_error:
             # Log but don't block login if DB fails
-            logger.error(f"Failed to persist user {email} to database: {str(db_error)}")
+            logger.error("Failed to persist user %s to database: %s", email, db_error)
         
         # Generate JWT token
         jwt_token = create_jwt_token(user_id=user_id, email=email, name=name, provider="google")
@@ -244,20 +238,20 @@ async def google_callback(request: Request, code: Optional[str] = None, error: O
         # Redirect to frontend with token
         callback_url = f"{FRONTEND_CALLBACK_URL}?token={jwt_token}"
         
-        logger.info(f"Redirecting user {email} to frontend with JWT token")
+        logger.debug("Redirecting user %s to frontend with JWT token", email)
         return RedirectResponse(url=callback_url)
         
     except requests.RequestException as e:
-        logger.error(f"Network error during OAuth callback: {str(e)}")
+        logger.error("Network error during OAuth callback: %s", e)
         error_url = f"{FRONTEND_CALLBACK_URL}?error=network_error"
         return RedirectResponse(url=error_url)
         
     except ValueError as e:
-        logger.error(f"OAuth configuration error: {str(e)}")
+        logger.error("OAuth configuration error: %s", e)
         error_url = f"{FRONTEND_CALLBACK_URL}?error=config_error"
         return RedirectResponse(url=error_url)
         
     except Exception as e:
-        logger.error(f"Unexpected error in OAuth callback: {str(e)}")
+        logger.error("Unexpected error in OAuth callback: %s", e)
         error_url = f"{FRONTEND_CALLBACK_URL}?error=unexpected_error"
         return RedirectResponse(url=error_url)
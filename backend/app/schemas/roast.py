@@ -1,14 +1,19 @@
-from typing import List, Literal
+from typing import List, Literal, Tuple, get_args
 from pydantic import BaseModel, Field
 
 
+# Supported roast intensities, shared by request validation and roast statistics
+RoastLevel = Literal["Soft", "Medium", "Nuclear"]
+ROAST_LEVELS: Tuple[str, ...] = get_args(RoastLevel)
+
+
 class RoastRequest(BaseModel):
     """Request schema for startup roast submission"""
     startup_name: str = Field(..., min_length=1, max_length=100, description="Name of the startup")
     idea_description: str = Field(..., min_length=10, max_length=2000, description="Description of the startup idea")
     target_users: str = Field(..., min_length=5, max_length=500, description="Target user base description")
     budget: str = Field(..., min_length=1, max_length=50, description="Budget information (flexible format)")
-    roast_level: Literal["Soft", "Medium", "Nuclear"] = Field(..., description="Intensity level of the roast")
+    roast_level: RoastLevel = Field(..., description="Intensity level of the roast")
 
     class Config:
         json_schema_extra = {
@@ -1,80 +1,259 @@
+import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Optional
-from supabase import create_client, Client
+import time
+from datetime import datetime, timezone
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
+import asyncpg
+import httpx
+import orjson
+from cachetools import TTLCache
+from postgrest import APIError, ReturnMethod
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from supabase import AsyncClient, AsyncClientOptions
 
 from app.config.settings import settings
-from app.schemas.roast import RoastRequest, RoastResponse
+from app.schemas.roast import ROAST_LEVELS, RoastRequest, RoastResponse
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+class OrjsonAsyncClient(httpx.AsyncClient):
+    """httpx client that serializes JSON request bodies with orjson instead of stdlib json"""
+    
+    def build_request(self, method: str, url: Any, *, json: Any = None, **kwargs: Any) -> httpx.Request:
+        if json is not None and kwargs.get("content") is None:
+            headers = httpx.Headers(kwargs.get("headers"))
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["headers"] = headers
+            kwargs["content"] = orjson.dumps(json)
+        return super().build_request(method, url, **kwargs)
+
+
+# Shared HTTP client so TCP + TLS handshakes to Supabase are reused across requests.
+# Keep postgrest's own timeout - httpx's 5s default is too short for batch inserts and stats scans.
+http_client = OrjsonAsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(DEFAULT_POSTGREST_CLIENT_TIMEOUT),
+    limits=httpx.Limits(max_keepalive_connections=50, keepalive_expiry=30),
+)
+
+# In-process cache for user lookups by email; misses are cached for a shorter time
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_missing_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_CACHE_MISS = object()
+
+# Columns returned by get_user_by_email (and therefore held in the user cache)
+USER_COLUMNS = "id,email,name,provider,provider_id,picture"
+
+# After a write, reads go to the primary for this long so a lagging replica can't refill caches
+REPLICA_LAG_SECONDS = 5
+_recently_written_users: TTLCache = TTLCache(maxsize=10_000, ttl=REPLICA_LAG_SECONDS)
+
+
+def _invalidate_user_cache(email: str) -> None:
+    """Drop any cached lookup for an email so the next read hits the primary database"""
+    _user_cache.pop(email, None)
+    _missing_user_cache.pop(email, None)
+    _recently_written_users[email] = True
+
+
+# Cached get_roast_stats result as (time.monotonic() timestamp, stats)
+STATS_CACHE_TTL_SECONDS = 30
+_stats_cache: Optional[Tuple[float, dict]] = None
+_stats_last_invalidated = float("-inf")
+
+
+def _invalidate_stats_cache() -> None:
+    """
+    Drop the cached roast statistics so the next read refetches them
+    
+    Runs at most once per STATS_CACHE_TTL_SECONDS, so steady roast traffic
+    (a flush every FLUSH_INTERVAL_SECONDS) doesn't defeat the cache.
+    """
+    global _stats_cache, _stats_last_invalidated
+    now = time.monotonic()
+    if now - _stats_last_invalidated < STATS_CACHE_TTL_SECONDS:
+        return
+    _stats_cache = None
+    _stats_last_invalidated = now
+
+
+# Background writer: queued rows are flushed as one multi-row insert per interval
+FLUSH_INTERVAL_SECONDS = 0.25
+MAX_BATCH_SIZE = 500
+# Rows held in memory per queue before new writes are rejected (e.g. during a Supabase outage)
+MAX_QUEUED_ROWS = 2_000
+
+
+async def _init_pg_connection(conn: asyncpg.Connection) -> None:
+    """Encode jsonb columns (e.g. survival_tips) with orjson on pooled connections"""
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=lambda value: orjson.dumps(value).decode(),
+        decoder=orjson.loads,
+        schema="pg_catalog"
+    )
+
+
 class DatabaseService:
     """Service for persisting roast data to Supabase"""
     
     def __init__(self):
-        """Initialize the Supabase client"""
+        """Initialize the async Supabase client on top of the shared HTTP client"""
         try:
-            self.supabase: Client = create_client(
+            self.supabase: AsyncClient = AsyncClient(
                 settings.supabase_url,
-                settings.supabase_key
+                settings.supabase_key,
+                options=AsyncClientOptions(httpx_client=http_client)
             )
+            
+            # Request builders hold no per-query state, so build them once instead of per call
+            self._users = self.supabase.table("users")
+            self._roasts = self.supabase.table("roasts")
+            self._events = self.supabase.table("login_events")
+            self._tables = {"users": self._users, "roasts": self._roasts, "login_events": self._events}
+            
             logger.info("✅ Supabase client initialized successfully")
         except Exception as e:
-            logger.error(f"❌ Failed to initialize Supabase client: {str(e)}")
+            logger.error("❌ Failed to initialize Supabase client: %s", e)
             raise
+        
+        # Read-only client for SELECTs; falls back to the primary when no replica is configured
+        self.supabase_ro: AsyncClient = self.supabase
+        if settings.supabase_replica_url:
+            try:
+                self.supabase_ro = AsyncClient(
+                    settings.supabase_replica_url,
+                    settings.supabase_key,
+                    options=AsyncClientOptions(httpx_client=http_client)
+                )
+                logger.info("✅ Supabase read replica client initialized successfully")
+            except Exception as e:
+                logger.error("❌ Failed to initialize Supabase read replica client - reads will use the primary: %s", e)
+        
+        self._users_ro = self.supabase_ro.table("users")
+        self._roasts_ro = self.supabase_ro.table("roasts")
+        
+        # Queues for fire-and-forget inserts, drained by start()'s flush tasks
+        self._roast_queue: "asyncio.Queue[Optional[dict]]" = asyncio.Queue(maxsize=MAX_QUEUED_ROWS)
+        self._login_event_queue: "asyncio.Queue[Optional[dict]]" = asyncio.Queue(maxsize=MAX_QUEUED_ROWS)
+        self._flush_tasks: List[asyncio.Task] = []
+        
+        # Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+        self._bg_tasks: Set[asyncio.Task] = set()
+        
+        # Direct Postgres pool for batched inserts, opened in start() when a pooler URL is set
+        self._pg_pool: Optional[asyncpg.Pool] = None
     
-    def upsert_user(self, email: str, name: str, provider_id: str, picture: Optional[str] = None, provider: str = "google") -> Optional[str]:
+    async def start(self) -> None:
+        """Open the Postgres pool (if configured) and start the background tasks that batch queued inserts"""
+        if self._flush_tasks:
+            return
+        
+        if settings.supabase_pooler_url:
+            try:
+                # Supavisor transaction mode can't keep named prepared statements, so disable the cache
+                self._pg_pool = await asyncpg.create_pool(
+                    dsn=settings.supabase_pooler_url,
+                    min_size=2,
+                    max_size=10,
+                    statement_cache_size=0,
+                    init=_init_pg_connection
+                )
+                logger.info("✅ Postgres pool opened via Supabase connection pooler")
+            except Exception as e:
+                logger.error("❌ Failed to open Postgres pool - batched inserts will use REST: %s", e)
+        
+        self._flush_tasks = [
+            asyncio.create_task(self._flush_loop(self._roast_queue, "roasts")),
+            asyncio.create_task(self._flush_loop(self._login_event_queue, "login_events")),
+        ]
+        logger.info("✅ Background database writer started")
+    
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Run a coroutine in the background without awaiting it"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
+    async def _flush_loop(self, queue: "asyncio.Queue[Optional[dict]]", table: str) -> None:
         """
-        Create or update a user in the database (idempotent operation)
+        Drain a queue into batched inserts until a None sentinel is received
         
         Args:
-            email: User's email address
-            name: User's full name
-            provider_id: Provider's unique user ID (required)
-            picture: User's profile picture URL (optional)
-            provider: OAuth provider (default: "google")
+            queue: Queue of rows to insert
+            table: Name of the table the rows belong to
+        """
+        stopping = False
+        while not stopping:
+            row = await queue.get()
+            if row is None:
+                break
+            
+            # Give concurrent requests a moment to enqueue so they share one insert
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            
+            batch = [row]
+            while len(batch) < MAX_BATCH_SIZE and not queue.empty():
+                row = queue.get_nowait()
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            
+            await self._insert_batch(table, batch)
+    
+    async def _insert_batch(self, table: str, rows: List[dict]) -> bool:
+        """
+        Insert rows into a table with a single request
+        
+        Goes through the pooled Postgres connection when available, otherwise PostgREST.
+        
+        Args:
+            table: Name of the table
+            rows: Rows to insert
             
         Returns:
-            str: The user's ID if successful, None if failed
+            bool: True if the insert succeeded, False otherwise
             
         Note:
-            Uses upsert to handle both new users and returning users.
-            Unique constraint is (provider_id, provider) composite key.
+            This method should not raise exceptions - failed batches are logged and dropped.
         """
         try:
-            user_data = {
-                "provider_id": provider_id,
-                "email": email,
-                "name": name,
-                "picture": picture,
-                "provider": provider,
-                "last_login": datetime.utcnow().isoformat(),
-            }
-            
-            logger.info(f"Upserting user to database: {email} (provider: {provider}, provider_id: {provider_id})")
-            
-            # Upsert: insert if new, update if exists (based on provider_id + provider uniqueness)
-            result = self.supabase.table("users").upsert(
-                user_data,
-                on_conflict="provider_id,provider"
-            ).execute()
-            
-            if result.data:
-                user_id = result.data[0].get("id")
-                logger.info(f"✅ User {email} upserted successfully with ID: {user_id}")
-                return user_id
+            if self._pg_pool:
+                await self._insert_batch_pg(table, rows)
             else:
-                logger.error(f"❌ No data returned from user upsert for {email}")
-                return None
-                
+                # Nothing reads the inserted rows back, so skip the response body
+                await self._tables[table].insert(rows, returning=ReturnMethod.minimal).execute()
+            if table == "roasts":
+                _invalidate_stats_cache()
+            logger.debug("✅ Inserted %d row(s) into %s", len(rows), table)
+            return True
         except Exception as e:
-            logger.error(f"❌ Failed to upsert user {email}: {str(e)}")
-            return None
+            logger.error("❌ Failed to insert %d row(s) into %s: %s", len(rows), table, e)
+            return False
     
-    def upsert_user(self, email: str, name: str, provider_id: str, picture: Optional[str] = None, provider: str = "google") -> Optional[str]:
+    async def _insert_batch_pg(self, table: str, rows: List[dict]) -> None:
+        """
+        Insert rows into a table over the pooled Postgres connection
+        
+        Args:
+            table: Name of the table (one of the service's known tables)
+            rows: Rows to insert; all rows must have the same keys
+        """
+        columns = list(rows[0])
+        query = "INSERT INTO {} ({}) VALUES ({})".format(
+            table,
+            ", ".join(f'"{column}"' for column in columns),
+            ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+        )
+        
+        async with self._pg_pool.acquire() as conn:
+            await conn.executemany(query, [tuple(row[column] for column in columns) for row in rows])
+    
+    async def upsert_user(self, email: str, name: str, provider_id: str, picture: Optional[str] = None, provider: str = "google") -> Optional[str]:
         """
         Create or update a user in the database (idempotent operation)
         
@@ -91,7 +270,11 @@ class DatabaseService:
         Note:
             Uses upsert to handle both new users and returning users.
             Unique constraint is (provider_id, provider) composite key.
+            last_login is stamped by the database (DEFAULT now() + update trigger).
+            Emails are stored lowercased so lookups hit the users.email index.
         """
+        email = email.lower()
+        
         try:
             user_data = {
                 "provider_id": provider_id,
@@ -99,30 +282,30 @@ class DatabaseService:
                 "name": name,
                 "picture": picture,
                 "provider": provider,
-                "last_login": datetime.utcnow().isoformat(),
             }
             
-            logger.info(f"Upserting user to database: {email} (provider: {provider}, provider_id: {provider_id})")
+            logger.debug("Upserting user to database: %s (provider: %s, provider_id: %s)", email, provider, provider_id)
             
             # Upsert: insert if new, update if exists (based on provider_id + provider uniqueness)
-            result = self.supabase.table("users").upsert(
+            result = await self._users.upsert(
                 user_data,
                 on_conflict="provider_id,provider"
             ).execute()
             
             if result.data:
                 user_id = result.data[0].get("id")
-                logger.info(f"✅ User {email} upserted successfully with ID: {user_id}")
+                _invalidate_user_cache(email)
+                logger.debug("✅ User %s upserted successfully with ID: %s", email, user_id)
                 return user_id
             else:
-                logger.error(f"❌ No data returned from user upsert for {email}")
+                logger.error("❌ No data returned from user upsert for %s", email)
                 return None
                 
         except Exception as e:
-            logger.error(f"❌ Failed to upsert user {email}: {str(e)}")
+            logger.error("❌ Failed to upsert user %s: %s", email, e)
             return None
     
-    def log_login_event(self, user_id: str, provider: str, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> None:
+    async def log_login_event(self, user_id: str, provider: str, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> None:
         """
         Log a login event for audit trail
         
@@ -134,24 +317,90 @@ class DatabaseService:
             
         Note:
             This method should not raise exceptions - it logs errors but doesn't block login flow.
+            The event is queued for the background writer when it is running, otherwise
+            it is inserted by a background task; either way this returns immediately.
+        """
+        event_data = {
+            "user_id": user_id,
+            "provider": provider,
+            "success": True,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        }
+        
+        if self._flush_tasks:
+            try:
+                self._login_event_queue.put_nowait(event_data)
+            except asyncio.QueueFull:
+                logger.warning("⚠️ Login event queue full - dropping login event for user %s", user_id)
+                return
+        else:
+            self._spawn(self._insert_batch("login_events", [event_data]))
+        logger.debug("Login event queued for user %s", user_id)
+    
+    async def login_user(self, email: str, name: str, provider_id: str, picture: Optional[str] = None, provider: str = "google", ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> Optional[str]:
+        """
+        Upsert a user and log their login event in a single database round-trip
+        
+        Args:
+            email: User's email address
+            name: User's full name
+            provider_id: Provider's unique user ID (required)
+            picture: User's profile picture URL (optional)
+            provider: OAuth provider (default: "google")
+            ip_address: Client IP address (optional)
+            user_agent: Client user agent string (optional)
+            
+        Returns:
+            str: The user's ID if successful, None if failed
+            
+        Note:
+            Uses the login_user() RPC (see SUPABASE_PERFORMANCE_MIGRATION.sql).
+            Falls back to upsert_user + log_login_event if the RPC is unavailable.
         """
+        email = email.lower()
+        
         try:
-            event_data = {
-                "user_id": user_id,
-                "provider": provider,
-                "success": True,
-                "timestamp": datetime.utcnow().isoformat(),
-                "ip_address": ip_address,
-                "user_agent": user_agent,
-            }
+            logger.debug("Logging in user via RPC: %s (provider: %s, provider_id: %s)", email, provider, provider_id)
             
-            self.supabase.table("login_events").insert(event_data).execute()
-            logger.info(f"✅ Login event logged for user {user_id}")
+            result = await self.supabase.rpc("login_user", {
+                "p_email": email,
+                "p_name": name,
+                "p_provider_id": provider_id,
+                "p_picture": picture,
+                "p_provider": provider,
+                "p_ip": ip_address,
+                "p_ua": user_agent,
+            }).execute()
             
+            if result.data:
+                _invalidate_user_cache(email)
+                logger.debug("✅ User %s logged in successfully with ID: %s", email, result.data)
+                return result.data
+            else:
+                logger.error("❌ No data returned from login_user RPC for %s", email)
+                return None
+                
         except Exception as e:
-            logger.error(f"❌ Failed to log login event for user {user_id}: {str(e)}")
+            logger.warning("⚠️ login_user RPC failed for %s, falling back to separate writes: %s", email, e)
+        
+        user_id = await self.upsert_user(
+            email=email,
+            name=name,
+            provider_id=provider_id,
+            picture=picture,
+            provider=provider
+        )
+        if user_id:
+            await self.log_login_event(
+                user_id=user_id,
+                provider=provider,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+        return user_id
     
-    def get_user_by_email(self, email: str) -> Optional[dict]:
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
         """
         Retrieve a user by email address
         
@@ -159,21 +408,44 @@ class DatabaseService:
             email: User's email address
             
         Returns:
-            dict: User record if found, None otherwise
+            dict: User record (USER_COLUMNS only) if found, None otherwise
+            
+        Note:
+            Results are cached in-process for 5 minutes (30 seconds for misses).
+            upsert_user invalidates the entry for the email it writes.
+            Emails are matched lowercased, the same way they are stored.
+            Reads use the replica, except right after this process wrote the user.
         """
+        email = email.lower()
+        
+        # Single .get() so an entry expiring between a check and a read can't raise KeyError
+        user = _user_cache.get(email, _CACHE_MISS)
+        if user is not _CACHE_MISS:
+            return user
+        if _missing_user_cache.get(email, _CACHE_MISS) is not _CACHE_MISS:
+            return None
+        
+        read_primary = email in _recently_written_users or self.supabase_ro is self.supabase
+        users = self._users if read_primary else self._users_ro
+        
         try:
-            result = self.supabase.table("users").select("*").eq("email", email).execute()
+            result = await users.select(USER_COLUMNS).eq("email", email).limit(1).maybe_single().execute()
             
-            if result.data and len(result.data) > 0:
-                return result.data[0]
+            if result is not None and result.data:
+                user = result.data
+                _user_cache[email] = user
+                return user
             else:
+                # A replica miss may only be lag, so just cache misses confirmed by the primary
+                if read_primary:
+                    _missing_user_cache[email] = None
                 return None
                 
         except Exception as e:
-            logger.error(f"❌ Failed to get user by email {email}: {str(e)}")
+            logger.error("❌ Failed to get user by email %s: %s", email, e)
             return None
     
-    def save_roast(self, request: RoastRequest, response: RoastResponse, user_id: Optional[str] = None) -> Optional[dict]:
+    async def save_roast(self, request: RoastRequest, response: RoastResponse, user_id: Optional[str] = None) -> bool:
         """
         Save a roast generation to the database
         
@@ -183,12 +455,16 @@ class DatabaseService:
             user_id: UUID of the authenticated user (optional)
             
         Returns:
-            dict: The inserted record if successful, None if failed
+            bool: True if the roast was queued or saved, False if failed
             
         Note:
-            This method should not raise exceptions - it logs errors and returns None
+            This method should not raise exceptions - it logs errors and returns False
             to ensure the user still receives their roast even if DB save fails.
             
+            When the background writer is running the roast is only queued here;
+            it is inserted together with other roasts on the next flush. If the
+            queue is full (the writer has fallen behind) the roast is dropped.
+            
             If user_id is provided, links the roast to that user.
             If user_id is None, saves as anonymous roast (user_id = NULL).
         """
@@ -211,71 +487,140 @@ class DatabaseService:
                 
                 # User linkage (can be NULL for anonymous roasts)
                 "user_id": user_id,
-                
-                # Metadata
-                "created_at": datetime.utcnow().isoformat(),
             }
             
-            logger.info(f"Saving roast to database for startup: {request.startup_name} (user_id: {user_id or 'anonymous'})")
+            logger.debug("Saving roast to database for startup: %s (user_id: %s)", request.startup_name, user_id or "anonymous")
             
-            # Insert the record into the roasts table
-            result = self.supabase.table("roasts").insert(roast_data).execute()
+            if self._flush_tasks:
+                try:
+                    self._roast_queue.put_nowait(roast_data)
+                except asyncio.QueueFull:
+                    logger.warning("⚠️ Roast queue full - dropping roast for %s", request.startup_name)
+                    return False
+                return True
             
-            if result.data:
-                logger.info(f"✅ Successfully saved roast for {request.startup_name} to database")
-                return result.data[0]
-            else:
-                logger.error(f"❌ No data returned from database insert for {request.startup_name}")
-                return None
+            # Writer not running (e.g. outside the app lifecycle) - insert directly
+            return await self._insert_batch("roasts", [roast_data])
                 
         except Exception as e:
             # Log the error but don't raise - this is fail-safe behavior
-            logger.error(f"❌ Failed to save roast for {request.startup_name} to database: {str(e)}")
-            logger.error(f"   Request data: startup_name={request.startup_name}, roast_level={request.roast_level}")
-            return None
+            logger.error("❌ Failed to save roast for %s to database: %s", request.startup_name, e)
+            logger.error("   Request data: startup_name=%s, roast_level=%s", request.startup_name, request.roast_level)
+            return False
     
-    def get_roast_stats(self) -> Optional[dict]:
+    async def get_roast_stats(self) -> Optional[dict]:
         """
         Get basic statistics about roasts in the database
         
+        Uses the get_roast_level_stats() RPC (see SUPABASE_PERFORMANCE_MIGRATION.sql)
+        so all counts come back in one round-trip, falling back to concurrent
+        count queries if the RPC is unavailable. The RPC is still an exact
+        GROUP BY scan over roasts (one scan instead of four), which is why the
+        result is cached.
+        
+        Results are read from the replica, cached for STATS_CACHE_TTL_SECONDS and
+        invalidated (at most once per TTL) when new roasts are inserted. Aggregate
+        counts tolerate a few seconds of replica lag.
+        
         Returns:
             dict: Statistics if successful, None if failed
         """
+        global _stats_cache
+        if _stats_cache and time.monotonic() - _stats_cache[0] < STATS_CACHE_TTL_SECONDS:
+            return _stats_cache[1]
+        
         try:
-            # Get total count
-            total_result = self.supabase.table("roasts").select("id", count="exact").execute()
-            total_count = total_result.count if total_result.count is not None else 0
-            
-            # Get count by roast level
-            level_stats = {}
-            for level in ["Soft", "Medium", "Nuclear"]:
-                level_result = self.supabase.table("roasts").select("id", count="exact").eq("roast_level", level).execute()
-                level_stats[level] = level_result.count if level_result.count is not None else 0
+            try:
+                # Get count by roast level in a single grouped query
+                # get=True runs the STABLE function read-only, which a hot-standby replica requires
+                result = await self.supabase_ro.rpc("get_roast_level_stats", get=True).execute()
+                counts = {row["roast_level"]: row["cnt"] for row in result.data or []}
+                
+                total_count = sum(counts.values())
+                level_stats = {level: counts.get(level, 0) for level in ROAST_LEVELS}
+            except Exception as e:
+                logger.warning("⚠️ get_roast_level_stats RPC failed, falling back to parallel counts: %s", e)
+                total_count, level_stats = await self._count_roasts_by_level()
             
-            return {
+            stats = {
                 "total_roasts": total_count,
                 "roast_levels": level_stats,
-                "last_updated": datetime.utcnow().isoformat()
+                "last_updated": datetime.now(timezone.utc).isoformat()
             }
+            _stats_cache = (time.monotonic(), stats)
+            return stats
             
         except Exception as e:
-            logger.error(f"❌ Failed to get roast statistics: {str(e)}")
+            logger.error("❌ Failed to get roast statistics: %s", e)
             return None
     
-    def health_check(self) -> bool:
+    async def _count_roasts_by_level(self) -> Tuple[int, Dict[str, int]]:
+        """
+        Count roasts in total and per level with concurrent count queries
+        
+        Uses PostgREST's estimated counts, which come from planner statistics
+        (pg_class.reltuples) on large tables instead of a full COUNT(*) scan.
+        Totals may be off by a few percent as a result.
+        
+        Returns:
+            tuple: Total roast count and a mapping of roast level to count
+        """
+        total_result, *level_results = await asyncio.gather(
+            self._roasts_ro.select("id", count="estimated").execute(),
+            *(
+                self._roasts_ro.select("id", count="estimated").eq("roast_level", level).execute()
+                for level in ROAST_LEVELS
+            )
+        )
+        
+        total_count = total_result.count if total_result.count is not None else 0
+        level_stats = {
+            level: level_result.count if level_result.count is not None else 0
+            for level, level_result in zip(ROAST_LEVELS, level_results)
+        }
+        return total_count, level_stats
+    
+    async def health_check(self) -> bool:
         """
         Check if the database connection is healthy
         
+        Uses the ping() RPC (see SUPABASE_PERFORMANCE_MIGRATION.sql), falling back
+        to a one-row select if the function doesn't exist yet.
+        
         Returns:
             bool: True if healthy, False otherwise
         """
         try:
-            # Simple query to test connection
-            result = self.supabase.table("roasts").select("id").limit(1).execute()
+            try:
+                # Minimal round-trip that doesn't touch any table
+                await self.supabase_ro.rpc("ping", get=True).execute()
+            except APIError as e:
+                # PGRST202: function not found - migration not applied yet
+                if e.code != "PGRST202":
+                    raise
+                await self._roasts_ro.select("id").limit(1).execute()
             return True
         except Exception as e:
-            logger.error(f"❌ Database health check failed: {str(e)}")
+            logger.error("❌ Database health check failed: %s", e)
             return False
+    
+    async def close(self) -> None:
+        """Flush queued inserts, then close the Postgres pool and the shared HTTP connection pool"""
+        if self._flush_tasks:
+            # put() waits for room, so the sentinel is never lost to a full queue
+            await self._roast_queue.put(None)
+            await self._login_event_queue.put(None)
+            await asyncio.gather(*self._flush_tasks)
+            self._flush_tasks = []
+        
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks)
+        
+        if self._pg_pool:
+            await self._pg_pool.close()
+            self._pg_pool = None
+        
+        await http_client.aclose()
 
 
 # Global database service instance